@@ -1,18 +1,64 @@
 # app/api/routes/auth.py
-from fastapi import APIRouter, HTTPException
+import hmac
+import time
+
+from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel
-from app.core.security import create_access_token
+from app.core.security import ACCESS_TOKEN_EXPIRE_MINUTES, create_access_token
 
 router = APIRouter()
 
+# Issued tokens keyed by subject: (exp timestamp, token). The claim set only
+# depends on "sub", so a still-valid token can be handed out again.
+_issued: dict[str, tuple[float, str]] = {}
+_REUSE_MARGIN_SECONDS = 30
+
 class LoginRequest(BaseModel):
     username: str
     password: str
 
-@router.post("/login")
-def login(credentials: LoginRequest):
-    if credentials.username != "admin" or credentials.password != "secret":
+def _check_credentials(username, password) -> None:
+    if not isinstance(username, str) or not isinstance(password, str):
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+    # Evaluate both comparisons so timing doesn't reveal which field was wrong
+    # surrogatepass: JSON may carry lone surrogates, which plain utf-8 can't encode
+    username_ok = hmac.compare_digest(username.encode("utf-8", "surrogatepass"), b"admin")
+    password_ok = hmac.compare_digest(password.encode("utf-8", "surrogatepass"), b"secret")
+    if not (username_ok & password_ok):
         raise HTTPException(status_code=401, detail="Invalid credentials")
-    
-    token = create_access_token({"sub": credentials.username})
-    return {"access_token": token, "token_type": "bearer"}
\ No newline at end of file
+
+def _issue_token(username: str) -> str:
+    cached = _issued.get(username)
+    if cached and cached[0] > time.time() + _REUSE_MARGIN_SECONDS:
+        return cached[1]
+
+    # exp is this plus the default lifetime, truncated to whole seconds by the
+    # encoder; the reuse margin absorbs that sub-second difference
+    expires_at = time.time() + ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    token = create_access_token({"sub": username})
+    _issued[username] = (expires_at, token)
+    return token
+
+@router.post("/login", response_model=None)
+async def login(request: Request):
+    """Hot path: reads the JSON body directly instead of validating a model."""
+    try:
+        body = await request.json()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Request body must be JSON")
+    if not isinstance(body, dict):
+        raise HTTPException(status_code=400, detail="Request body must be a JSON object")
+
+    username = body.get("username")
+    _check_credentials(username, body.get("password"))
+
+    token = _issue_token(username)
+    return {"access_token": token, "token_type": "bearer"}
+
+@router.post("/login/v2", response_model=None)
+def login_v2(credentials: LoginRequest):
+    """Same as /login, validated through LoginRequest for the OpenAPI schema."""
+    _check_credentials(credentials.username, credentials.password)
+
+    token = _issue_token(credentials.username)
+    return {"access_token": token, "token_type": "bearer"}
@@ -1,18 +0,0 @@
-# app/api/routes/auth.py
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from app.core.security import create_access_token
-
-router = APIRouter()
-
-class LoginRequest(BaseModel):
-    username: str
-    password: str
-
-@router.post("/login")
-def login(credentials: LoginRequest):
-    if credentials.username != "admin" or credentials.password != "secret":
-        raise HTTPException(status_code=401, detail="Invalid credentials")
-    
-    token = create_access_token({"sub": credentials.username})
-    return {"access_token": token, "token_type": "bearer"}
\ No newline at end of file
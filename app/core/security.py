@@ -1,9 +1,17 @@
 # app/core/security.py
+import os
+
+from dotenv import load_dotenv
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
 from fastapi import HTTPException, status
 
+load_dotenv()
+
 # Load from .env or config.py
+# Resolved once as bytes; requests compare against the raw header bytes
+API_TOKEN_B: bytes = os.environ.get("API_TOKEN", "test-token-12345").encode("ascii")
+API_TOKEN = API_TOKEN_B.decode("ascii")
 SECRET_KEY = "seed"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
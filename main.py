@@ -1,40 +1,83 @@
 import os
 import logging
+import queue
+import time
 from datetime import datetime
-from functools import wraps
+from logging.handlers import QueueHandler, QueueListener
 
-from fastapi import FastAPI, Depends, HTTPException, Header, Request
+import orjson
+from fastapi import FastAPI, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
-from dotenv import load_dotenv
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
 
 from app.api.routes import auth
-
-# ============================================
-# Load environment variables
-# ============================================
-load_dotenv()
+from app.core.security import API_TOKEN
+from app.dependencies import BEARER_AUTH_OPENAPI, BEARER_AUTH_SCHEME, verify_token
 
 # ============================================
 # Logging Configuration
 # ============================================
+class CachedTimeFormatter(logging.Formatter):
+    """Formatter that renders the default asctime date part once per second.
+
+    An explicit datefmt bypasses the cache and uses the stock formatting.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cached_second = None
+        self._cached_time = ""
+
+    def formatTime(self, record, datefmt=None):
+        if datefmt:
+            return super().formatTime(record, datefmt)
+        second = int(record.created)
+        if second != self._cached_second:
+            self._cached_second = second
+            self._cached_time = time.strftime("%Y-%m-%d %H:%M:%S", self.converter(second))
+        return "%s,%03d" % (self._cached_time, record.msecs)
+
+log_formatter = CachedTimeFormatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+file_handler = logging.FileHandler("app.log")
+stream_handler = logging.StreamHandler()
+file_handler.setFormatter(log_formatter)
+stream_handler.setFormatter(log_formatter)
+
+# Records are queued on the event loop thread and written by a listener
+# thread, so file/console I/O never blocks request handling.
+log_queue = queue.Queue(-1)
+log_listener = QueueListener(log_queue, file_handler, stream_handler)
+log_listener.start()
+
+# Unknown LOG_LEVEL values fall back to WARNING instead of failing at import
+log_level = os.getenv("LOG_LEVEL", "WARNING").upper()
+if not isinstance(logging.getLevelName(log_level), int):
+    log_level = "WARNING"
+
 logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.FileHandler("app.log"),
-        logging.StreamHandler(),
-    ],
+    level=log_level,
+    format="%(message)s",  # final formatting happens in the listener's handlers
+    handlers=[QueueHandler(log_queue)],
 )
 logger = logging.getLogger(__name__)
 
 # ============================================
 # FastAPI App Initialization
 # ============================================
-app = FastAPI(title="Linkaxom API", version="1.0.0")
+app = FastAPI(
+    title="Linkaxom API",
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+)
 
 # Include routes (e.g., /login)
 app.include_router(auth.router)
 
+@app.on_event("shutdown")
+def stop_log_listener():
+    # Drains the queue and flushes the handlers before exit
+    log_listener.stop()
+
 # ============================================
 # CORS Configuration (🔥 REQUIRED for frontend)
 # ============================================
@@ -52,132 +95,138 @@ app.add_middleware(
 )
 
 # ============================================
-# Token Verification
+# Request Logging Middleware
 # ============================================
-API_TOKEN = os.getenv("API_TOKEN", "test-token-12345")
-
-async def verify_token(authorization: str = Header(None)) -> str:
-    """Validates Bearer token in Authorization header."""
-    if not authorization:
-        logger.warning("❌ Missing Authorization header")
-        raise HTTPException(
-            status_code=401,
-            detail="Authorization header missing",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-
-    parts = authorization.split()
-    if len(parts) != 2 or parts[0].lower() != "bearer":
-        logger.warning(f"❌ Invalid header format: {authorization}")
-        raise HTTPException(
-            status_code=401,
-            detail="Invalid authorization header format. Use 'Bearer <token>'",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-
-    token = parts[1]
-    if token != API_TOKEN:
-        logger.warning(f"❌ Invalid token attempt: ***{token[-4:]}")
-        raise HTTPException(
-            status_code=401,
-            detail="Invalid token",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+def _client_ip(request: Request) -> str:
+    # Only looked up when a failure is logged
+    return request.client.host if request.client else "unknown"
 
-    logger.info(f"✅ Token verified: ***{token[-4:]}")
-    return token
+async def log_requests(request: Request, call_next):
+    path = request.url.path
+    # "Bearer " plus more than four token characters before a tail is shown
+    auth_header = request.headers.get("authorization")
+    masked_token = "***" + auth_header[-4:] if auth_header and len(auth_header) > 11 else "None"
 
-# ============================================
-# Logging Decorator
-# ============================================
-def log_request(func):
-    @wraps(func)
-    async def wrapper(*args, **kwargs):
-        request: Request = kwargs.get("request")
-        client_ip = request.client.host if request and request.client else "unknown"
-        token = request.headers.get("Authorization", "None").replace("Bearer ", "")
-        masked_token = f"***{token[-4:]}" if token and len(token) > 4 else "None"
+    logger.info("📥 REQUEST | %s | Token: %s", path, masked_token)
 
-        logger.info(f"📥 REQUEST | {func.__name__} | IP: {client_ip} | Token: {masked_token}")
+    start = time.perf_counter()
+    try:
+        response = await call_next(request)
+    except Exception as e:
+        duration = time.perf_counter() - start
+        logger.error("❌ ERROR | %s | %.2fs | IP: %s | %s", path, duration, _client_ip(request), e)
+        raise
 
-        import time
-        start = time.time()
-
-        try:
-            result = await func(*args, **kwargs)
-            duration = time.time() - start
-            logger.info(f"✅ SUCCESS | {func.__name__} | {duration:.2f}s | IP: {client_ip}")
-            return result
-        except Exception as e:
-            duration = time.time() - start
-            logger.error(f"❌ ERROR | {func.__name__} | {duration:.2f}s | {e}")
-            raise
+    duration = time.perf_counter() - start
+    if response.status_code >= 400:
+        logger.info(
+            "❌ FAILED | %s | %s | %.2fs | IP: %s",
+            path, response.status_code, duration, _client_ip(request),
+        )
+    else:
+        logger.info("✅ SUCCESS | %s | %s | %.2fs", path, response.status_code, duration)
+    return response
 
-    return wrapper
+# BaseHTTPMiddleware wraps every call_next in a task group and streams, so only
+# install it when INFO records will actually be emitted (the level is fixed at import)
+if logger.isEnabledFor(logging.INFO):
+    app.middleware("http")(log_requests)
 
 # ============================================
 # Public Endpoints
 # ============================================
-@app.get("/")
+# Health checks don't need sub-second precision: [epoch second, ISO string]
+_root_timestamp = [0, ""]
+
+@app.get("/", response_model=None)
 async def root():
+    now = int(time.time())
+    if now != _root_timestamp[0]:
+        _root_timestamp[0] = now
+        _root_timestamp[1] = datetime.fromtimestamp(now).isoformat()
     return {
         "message": "API is running!",
         "status": "healthy",
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": _root_timestamp[1],
     }
 
-@app.get("/public")
+# Static payloads are serialized once at import. A fresh Response wraps the
+# bytes per request because middleware (e.g. CORS) mutates response headers.
+_PUBLIC_BODY = orjson.dumps({
+    "message": "This is a public endpoint",
+    "auth_required": False,
+})
+
+_TOKEN_INFO_BODY = orjson.dumps({
+    "token": API_TOKEN,
+    "usage": "Use this header: Authorization: Bearer " + API_TOKEN,
+    "warning": "Remove this endpoint in production!",
+})
+
+@app.get("/public", response_model=None)
 async def public_endpoint():
-    return {
-        "message": "This is a public endpoint",
-        "auth_required": False,
-    }
+    return Response(_PUBLIC_BODY, media_type="application/json")
 
-@app.get("/token-info")
+@app.get("/token-info", response_model=None)
 async def token_info():
-    return {
-        "token": API_TOKEN,
-        "usage": "Use this header: Authorization: Bearer " + API_TOKEN,
-        "warning": "Remove this endpoint in production!",
-    }
+    return Response(_TOKEN_INFO_BODY, media_type="application/json")
 
 # ============================================
 # Protected Endpoints
 # ============================================
-@app.get("/protected")
-@log_request
-async def protected_endpoint(request: Request, token: str = Depends(verify_token)):
-    return {
-        "message": "JWT verified!",
-        "token_valid": True,
-        "masked_token": f"***{token[-4:]}"
-    }
-
-@app.post("/protected/data")
-@log_request
+_ADMIN_BODY = orjson.dumps({
+    "message": "Welcome to admin area",
+    "auth_required": True,
+    "access_level": "admin",
+})
+
+# Only "user" varies; it is JSON-encoded on its own so quotes are escaped
+_PROTECTED_TEMPLATE = b'{"message":"JWT verified!","user":%b,"token_valid":true}'
+
+@app.get("/protected", response_model=None, openapi_extra=BEARER_AUTH_OPENAPI)
+async def protected_endpoint(token_data: dict = Depends(verify_token)):
+    return Response(
+        _PROTECTED_TEMPLATE % orjson.dumps(token_data["sub"]),
+        media_type="application/json",
+    )
+
+# Echoes arbitrary client JSON, which orjson can't always encode (e.g. integers
+# beyond 64 bits), so this route keeps the stdlib encoder
+@app.post(
+    "/protected/data",
+    response_model=None,
+    response_class=JSONResponse,
+    openapi_extra=BEARER_AUTH_OPENAPI,
+)
 async def protected_post_endpoint(
-    request: Request,
     data: dict,
-    token: str = Depends(verify_token),
+    token_data: dict = Depends(verify_token),
 ):
     return {
         "message": "Data received successfully",
         "received_data": data,
         "auth_required": True,
-        "masked_token": f"***{token[-4:]}"
+        "user": token_data["sub"],
     }
 
-@app.get("/admin")
-@log_request
-async def admin_endpoint(
-    request: Request,
-    token: str = Depends(verify_token),
-):
-    return {
-        "message": "Welcome to admin area",
-        "auth_required": True,
-        "access_level": "admin",
-    }
+@app.get("/admin", response_model=None, openapi_extra=BEARER_AUTH_OPENAPI)
+async def admin_endpoint(token_data: dict = Depends(verify_token)):
+    return Response(_ADMIN_BODY, media_type="application/json")
+
+# ============================================
+# OpenAPI Security Scheme
+# ============================================
+_default_openapi = app.openapi
+
+def openapi_with_bearer_auth():
+    """Adds the BearerAuth scheme so /docs can send tokens to protected routes."""
+    if app.openapi_schema is None:
+        schema = _default_openapi()
+        components = schema.setdefault("components", {})
+        components.setdefault("securitySchemes", {})["BearerAuth"] = BEARER_AUTH_SCHEME
+    return app.openapi_schema
+
+app.openapi = openapi_with_bearer_auth
 
 # ============================================
 # Run the server
@@ -186,4 +235,12 @@ if __name__ == "__main__":
     import uvicorn
     print(f"\n🔑 Your API Token: {API_TOKEN}")
     print("📝 Add this header to Postman: Authorization: Bearer " + API_TOKEN + "\n")
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=8000,
+        access_log=os.getenv("UVICORN_ACCESS_LOG", "0") == "1",
+        proxy_headers=False,
+        server_header=False,
+        date_header=False,
+    )